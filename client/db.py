@@ -1,5 +1,5 @@
 # client/db.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from .local_models import Base
 import os
@@ -8,6 +8,17 @@ DB_PATH = os.path.join(os.path.dirname(__file__), "health_local.db")
 engine = create_engine(f"sqlite:///{DB_PATH}", future=True, echo=False)
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_conn, _):
+    # WAL + NORMAL: один fsync на чекпоинт, а не на каждый COMMIT
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-8000")  # ~8 МБ кэша страниц
+    cursor.close()
+
 def init_db():
     Base.metadata.create_all(bind=engine)
 
@@ -5,12 +5,12 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton,
     QVBoxLayout, QWidget, QTextEdit, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 from .db import init_db, get_db
 from .local_models import User, Device
-from .worker import DatabaseWorker
+from .worker import DatabaseWorker, SyncJob
 from .cleanup import cleanup_old_data
-from .sync import sync_to_cloud
+from .sync import http_client
 
 class HealthClient(QMainWindow):
     def __init__(self):
@@ -21,6 +21,7 @@ class HealthClient(QMainWindow):
         self.user_id = None
         self.device_id = None
         self.worker = None
+        self.sync_job = None
 
         # GUI
         central = QWidget()
@@ -115,13 +116,10 @@ class HealthClient(QMainWindow):
         self.sync_btn.setEnabled(False)
         self.log("Синхронизация...")
         jwt = "YOUR_JWT_HERE"
-        try:
-            sync_to_cloud(jwt)
-            self.log("Синхронизация завершена")
-        except Exception as e:
-            self.log(f"[SYNC ERROR] {e}")
-        finally:
-            self.sync_btn.setEnabled(True)
+        self.sync_job = SyncJob(jwt)
+        self.sync_job.signals.log_message.connect(self.log)
+        self.sync_job.signals.finished.connect(lambda: self.sync_btn.setEnabled(True))
+        QThreadPool.globalInstance().start(self.sync_job)
 
     def log(self, msg: str):
         ts = datetime.now().strftime("%H:%M:%S")
@@ -132,6 +130,8 @@ class HealthClient(QMainWindow):
         if self.worker:
             self.worker.stop()
             self.worker.wait()
+        QThreadPool.globalInstance().waitForDone()
+        http_client.close()
         event.accept()
 
 
@@ -0,0 +1,93 @@
+# client/ml.py
+import os
+import numpy as np
+import onnxruntime as ort
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+MODEL_PATH = os.path.join(MODEL_DIR, "stress_model.onnx")
+INT8_MODEL_PATH = os.path.join(MODEL_DIR, "stress_model_int8.onnx")
+
+
+class StressModel:
+    def __init__(self, model_path: str = MODEL_PATH):
+        self.ml_session = self._create_session(model_path)
+        self._input_name = self.ml_session.get_inputs()[0].name
+        self._output_name = self.ml_session.get_outputs()[0].name
+
+        # Вход 1x1 выделяется один раз, OrtValue ссылается на ту же память
+        self._in = np.zeros((1, 1), dtype=np.float32)
+        self._iob = self.ml_session.io_binding()
+        self._iob.bind_ortvalue_input(self._input_name, ort.OrtValue.ortvalue_from_numpy(self._in))
+        self._iob.bind_output(self._output_name)
+
+        # Прогрев: первый run выделяет память и готовит ядра
+        self.predict_stress(0.0)
+
+    def predict_stress(self, heart_rate: float) -> float:
+        self._in[0, 0] = heart_rate
+        self.ml_session.run_with_iobinding(self._iob)
+        return float(self._iob.copy_outputs_to_cpu()[0].ravel()[0])
+
+    @staticmethod
+    def _session_options(level):
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = 1
+        sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        sess_options.graph_optimization_level = level
+        return sess_options
+
+    def _load_session(self, path: str):
+        return ort.InferenceSession(
+            path,
+            self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL),
+            providers=["CPUExecutionProvider"],
+        )
+
+    def _save_optimized(self, model_path: str, opt_path: str) -> bool:
+        # EXTENDED, а не ALL: ALL добавляет зависящие от железа узлы (NCHWc),
+        # и сохранённый граф нельзя было бы переносить на другую машину
+        sess_options = self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+        sess_options.optimized_model_filepath = opt_path
+        try:
+            ort.InferenceSession(model_path, sess_options, providers=["CPUExecutionProvider"])
+            return True
+        except Exception:
+            return False  # например, каталог моделей только для чтения
+
+    def _create_session(self, model_path: str):
+        # Оптимизированный граф кэшируется рядом с моделью. Версия ORT в имени
+        # файла: после обновления onnxruntime граф пересобирается
+        opt_path = f"{os.path.splitext(model_path)[0]}_opt_ort{ort.__version__}.onnx"
+        fresh = os.path.isfile(opt_path) and os.path.getmtime(opt_path) >= os.path.getmtime(model_path)
+        saved = not fresh and self._save_optimized(model_path, opt_path)
+
+        if fresh or saved:
+            try:
+                # Кэш грузится с ALL: аппаратно-зависимые проходы выполняются здесь
+                return self._load_session(opt_path)
+            except Exception:
+                # Битый или несовместимый кэш — пересобираем один раз
+                if fresh and self._save_optimized(model_path, opt_path):
+                    try:
+                        return self._load_session(opt_path)
+                    except Exception:
+                        pass
+
+        # Без кэша: исходная модель с полной оптимизацией
+        return self._load_session(model_path)
+
+def quantize_model(src: str = MODEL_PATH, dst: str = INT8_MODEL_PATH):
+    # Офлайн: веса FP32 -> INT8, на CPU примерно вдвое меньше латентность
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+
+
+def load_stress_model():
+    for path in (INT8_MODEL_PATH, MODEL_PATH):
+        if os.path.exists(path):
+            return StressModel(path)
+    return None
+
+
+if __name__ == "__main__":
+    quantize_model()
\ No newline at end of file
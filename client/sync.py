@@ -1,58 +1,42 @@
 # client/sync.py
-import requests
+import httpx
+import orjson
 from .db import get_db
 from .local_models import SensorVector
-from sqlalchemy import delete
+from sqlalchemy import delete, select, tuple_
+
+# Все колонки, кроме серверных (created_at)
+SYNC_COLUMNS = [c for c in SensorVector.__table__.c if c.name != "created_at"]
+SYNC_KEY = tuple_(SensorVector.id, SensorVector.timestamp, SensorVector.user_id)
+DELETE_CHUNK = 300  # 3 параметра на строку, меньше лимита SQLite в 999 переменных
+
+# Один клиент на процесс: keep-alive соединение между синхронизациями
+http_client = httpx.Client(timeout=10, headers={"Accept-Encoding": "br, gzip"})
 
 def sync_to_cloud(jwt_token: str, api_url: str = "http://localhost:8000/sync"):
-    headers = {"Authorization": f"Bearer {jwt_token}"}
+    headers = {
+        "Authorization": f"Bearer {jwt_token}",
+        "Content-Type": "application/json",
+    }
     db = next(get_db())
     try:
-        vectors = db.query(SensorVector).all()
-        data = []
-        for v in vectors:
-            item = {
-                "id": v.id,
-                "user_id": v.user_id,
-                "device_id": v.device_id,
-                "timestamp": v.timestamp.isoformat() if v.timestamp else None,
-                "heart_rate": v.heart_rate,
-                "hrv_rmssd": v.hrv_rmssd,
-                "hrv_sdnn": v.hrv_sdnn,
-                "spo2": v.spo2,
-                "skin_temperature": v.skin_temperature,
-                "accel_x": v.accel_x,
-                "accel_y": v.accel_y,
-                "accel_z": v.accel_z,
-                "gyro_x": v.gyro_x,
-                "gyro_y": v.gyro_y,
-                "gyro_z": v.gyro_z,
-                "steps_count": v.steps_count,
-                "noise_level_db": v.noise_level_db,
-                "breathing_rate": v.breathing_rate,
-                "activity_type": v.activity_type,
-                "location_type": v.location_type,
-                "battery_level": v.battery_level,
-                "stress_level": v.stress_level,
-                "energy_level": v.energy_level,
-                "focus_level": v.focus_level,
-                "model_version": v.model_version,
-                "confidence_score": v.confidence_score,
-                "raw_features": v.raw_features,
-                "lora_weights": v.lora_weights,
-                "signal_quality": v.signal_quality,
-            }
-            data.append(item)
+        # Core SELECT без ORM-объектов, сразу в dict
+        result = db.execute(select(*SYNC_COLUMNS))
+        data = [dict(row) for row in result.mappings()]
 
         if not data:
             print("[SYNC] Нет данных для синхронизации")
             return
 
-        response = requests.post(api_url, json=data, headers=headers)
+        # orjson сам сериализует datetime в ISO 8601
+        response = http_client.post(api_url, content=orjson.dumps(data), headers=headers)
         if response.status_code == 200:
-            # Удалить после успешной отправки
-            stmt = delete(SensorVector)  # ← ПРАВИЛЬНО
-            db.execute(stmt)
+            # Удалить после успешной отправки — ровно отправленные записи по PK,
+            # новые строки воркера за время загрузки остаются в очереди
+            keys = [(item["id"], item["timestamp"], item["user_id"]) for item in data]
+            for i in range(0, len(keys), DELETE_CHUNK):
+                stmt = delete(SensorVector).where(SYNC_KEY.in_(keys[i:i + DELETE_CHUNK]))
+                db.execute(stmt)
             db.commit()
             print(f"[SYNC] Успешно отправлено и удалено {len(data)} записей")
         else:
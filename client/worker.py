@@ -1,11 +1,20 @@
 # client/worker.py
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThread, pyqtSignal
+from sqlalchemy import insert
+import numpy as np
+import threading
 from .db import get_db
 from .local_models import SensorVector
+from .ml import load_stress_model
+from .sync import sync_to_cloud
 import random
-from datetime import datetime
 import time
 
+SAMPLE_INTERVAL = 5   # секунд между замерами
+FLUSH_INTERVAL = 30   # секунд между записями буфера в SQLite
+BUFFER_SIZE = 512     # строк в буфере до принудительной записи
+MAX_FLUSH_FAILURES = 3  # неудачных записей подряд, после которых буфер сбрасывается
+
 class DatabaseWorker(QThread):
     data_collected = pyqtSignal(dict)
     log_message = pyqtSignal(str)
@@ -15,41 +24,139 @@ class DatabaseWorker(QThread):
         self.user_id = user_id
         self.device_id = device_id
         self.running = True
+        self._stop_event = threading.Event()
+        self.db = None
 
-    def run(self):
-        while self.running:
-            self.collect_data()
-            time.sleep(5)
+        # Буфер замеров в виде параллельных массивов (SoA)
+        self._n = 0
+        self._flush_failures = 0
+        self._buf_id = np.empty(BUFFER_SIZE, dtype=np.int64)
+        self._buf_ts = np.empty(BUFFER_SIZE, dtype="<i8")  # микросекунды UTC
+        self._buf_hr = np.empty(BUFFER_SIZE, dtype=np.uint16)
+        self._buf_hrv = np.empty(BUFFER_SIZE, dtype=np.float64)
+        self._buf_spo2 = np.empty(BUFFER_SIZE, dtype=np.uint8)
+        self._buf_stress = np.empty(BUFFER_SIZE, dtype=np.float64)
+        self._buf_conf = np.empty(BUFFER_SIZE, dtype=np.float64)
+        self._buf_steps = np.empty(BUFFER_SIZE, dtype=np.uint16)
+        self.stress_model = load_stress_model()
 
-    def collect_data(self):
+    def run(self):
+        # Одна сессия SQLite на всё время жизни потока
         db_gen = get_db()
-        db = next(db_gen)
+        self.db = next(db_gen)
         try:
-            vector = SensorVector(
-                id=random.randint(1000000, 9999999),
+            last_flush = time.monotonic()
+            while self.running:
+                self.collect_data()
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL:
+                    self.flush()
+                    last_flush = time.monotonic()
+                self._stop_event.wait(SAMPLE_INTERVAL)
+            self.flush()
+        finally:
+            self.db.close()
+
+    def collect_data(self):
+        heart_rate = random.randint(60, 100)
+        if self.stress_model:
+            stress_level = round(self.stress_model.predict_stress(heart_rate), 2)
+        else:
+            stress_level = round(random.uniform(0, 1), 2)
+
+        if self._n == BUFFER_SIZE:
+            self.flush()
+        if self._n == BUFFER_SIZE:
+            self.log_message.emit("[ERROR] Буфер переполнен, замер пропущен")
+            return
+
+        i = self._n
+        self._buf_id[i] = random.randint(1000000, 9999999)
+        self._buf_ts[i] = time.time_ns() // 1000
+        self._buf_hr[i] = heart_rate
+        self._buf_hrv[i] = round(random.uniform(20, 80), 2)
+        self._buf_spo2[i] = random.randint(95, 100)
+        self._buf_stress[i] = stress_level
+        self._buf_conf[i] = round(random.uniform(0.7, 0.99), 2)
+        self._buf_steps[i] = random.randint(0, 50)
+        self._n += 1
+
+        data = {"hr": heart_rate, "stress": stress_level}
+        self.data_collected.emit(data)
+        self.log_message.emit(f"HR={heart_rate}, Stress={stress_level:.2f}")
+
+    def flush(self):
+        # Весь буфер — одним executemany в одной транзакции (один fsync)
+        n = self._n
+        if not n:
+            return
+
+        # Все метки времени конвертируются в datetime одним вызовом numpy
+        timestamps = self._buf_ts[:n].astype("datetime64[us]").tolist()
+        rows = [
+            dict(
+                id=id_,
                 user_id=self.user_id,
                 device_id=self.device_id,
-                timestamp=datetime.utcnow(),
-                heart_rate=random.randint(60, 100),
-                hrv_rmssd=round(random.uniform(20, 80), 2),
-                spo2=random.randint(95, 100),
-                stress_level=round(random.uniform(0, 1), 2),
+                timestamp=ts,
+                heart_rate=hr,
+                hrv_rmssd=hrv,
+                spo2=spo2,
+                stress_level=stress,
                 model_version="v1.0",
-                confidence_score=round(random.uniform(0.7, 0.99), 2),
-                steps_count=random.randint(0, 50)
+                confidence_score=conf,
+                steps_count=steps,
             )
-            db.add(vector)
-            db.commit()
-
-            data = {"hr": vector.heart_rate, "stress": vector.stress_level}
-            self.data_collected.emit(data)
-            self.log_message.emit(f"HR={vector.heart_rate}, Stress={vector.stress_level:.2f}")
+            for id_, ts, hr, hrv, spo2, stress, conf, steps in zip(
+                self._buf_id[:n].tolist(),
+                timestamps,
+                self._buf_hr[:n].tolist(),
+                self._buf_hrv[:n].tolist(),
+                self._buf_spo2[:n].tolist(),
+                self._buf_stress[:n].tolist(),
+                self._buf_conf[:n].tolist(),
+                self._buf_steps[:n].tolist(),
+            )
+        ]
 
+        try:
+            self.db.execute(insert(SensorVector), rows)
+            self.db.commit()
+            self._n = 0
+            self._flush_failures = 0
         except Exception as e:
-            db.rollback()
+            self.db.rollback()
             self.log_message.emit(f"[ERROR] {e}")
-        finally:
-            db.close()
+            # Один плохой батч не должен навсегда остановить сбор данных
+            self._flush_failures += 1
+            if self._flush_failures >= MAX_FLUSH_FAILURES:
+                self.log_message.emit(
+                    f"[ERROR] {n} замеров отброшено после {self._flush_failures} неудачных записей"
+                )
+                self._n = 0
+                self._flush_failures = 0
 
     def stop(self):
-        self.running = False
\ No newline at end of file
+        self.running = False
+        self._stop_event.set()
+
+
+class SyncSignals(QObject):
+    finished = pyqtSignal()
+    log_message = pyqtSignal(str)
+
+
+class SyncJob(QRunnable):
+    # Загрузка в облако в QThreadPool, чтобы не блокировать GUI
+    def __init__(self, jwt_token):
+        super().__init__()
+        self.jwt_token = jwt_token
+        self.signals = SyncSignals()
+
+    def run(self):
+        try:
+            sync_to_cloud(self.jwt_token)
+            self.signals.log_message.emit("Синхронизация завершена")
+        except Exception as e:
+            self.signals.log_message.emit(f"[SYNC ERROR] {e}")
+        finally:
+            self.signals.finished.emit()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # server/main.py
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import Column, Integer, String, DateTime, JSON, func
+from sqlalchemy import Column, Integer, String, DateTime, JSON, func, select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from pydantic import BaseModel
@@ -9,7 +11,10 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 import jwt
 from passlib.context import CryptContext
+import asyncio
 import os
+import time
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # === ЗАГРУЖАЕМ .env ===
@@ -27,11 +32,25 @@ if not SECRET_KEY:
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2id для новых хэшей, старые bcrypt-хэши по-прежнему проверяются
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=64 * 1024,
+    argon2__parallelism=2,
+)
 security = HTTPBearer()
 
 # === ДВИЖОК ===
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={"server_settings": {"jit": "off"}},  # короткие OLTP-запросы
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 # === БАЗА ===
@@ -93,18 +112,28 @@ class VectorDB(Base):
     model_weights = Column(JSON, nullable=True)
 
 # === FastAPI ===
-app = FastAPI(title="Health Monitor API")
+app = FastAPI(title="Health Monitor API", default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # === Токен ===
+@lru_cache(maxsize=4096)
+def decode_token(token: str) -> dict:
+    # Кэшируются только успешно проверенные токены (исключения не кэшируются)
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if not username:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return username
+        payload = decode_token(credentials.credentials)
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    # Для записи из кэша exp проверяем сами
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise HTTPException(status_code=401, detail="Token expired")
+    username: str = payload.get("sub")
+    if not username:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return username
 
 # === Эндпоинты ===
 @app.get("/")
@@ -113,13 +142,13 @@ async def root():
 
 @app.post("/auth/register", response_model=Token)
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    from sqlalchemy import select
     result = await db.execute(select(UserDB).where(UserDB.username == user.username))
     db_user = result.scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_password = pwd_context.hash(user.password)
+    # Хэширование ~100 мс CPU — не блокируем event loop
+    hashed_password = await asyncio.to_thread(pwd_context.hash, user.password)
     db_user = UserDB(
         username=user.username,
         email=user.email,
@@ -142,7 +171,6 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
 
 @app.get("/users/me", response_model=User)
 async def read_users_me(username: str = Depends(verify_token), db: AsyncSession = Depends(get_db)):
-    from sqlalchemy import select
     result = await db.execute(select(UserDB).where(UserDB.username == username))
     user = result.scalars().first()
     if not user:
@@ -3,6 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPBearer
 import jwt
 import os
+import time
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,12 +14,21 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 router = APIRouter()
 security = HTTPBearer()
 
+@lru_cache(maxsize=4096)
+def decode_token(token: str) -> dict:
+    # Кэшируются только успешно проверенные токены (исключения не кэшируются)
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
 async def verify_token(credentials: HTTPBearer = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if not username:
-            raise HTTPException(401, "Invalid token")
-        return username
+        payload = decode_token(credentials.credentials)
     except jwt.PyJWTError:
-        raise HTTPException(401, "Invalid token")
\ No newline at end of file
+        raise HTTPException(401, "Invalid token")
+    # Для записи из кэша exp проверяем сами
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise HTTPException(401, "Token expired")
+    username: str = payload.get("sub")
+    if not username:
+        raise HTTPException(401, "Invalid token")
+    return username
\ No newline at end of file
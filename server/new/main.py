@@ -1,11 +1,14 @@
 # server/main.py
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from .database import engine
 from .models import Base
 from .auth import router as auth_router
 from .sync import router as sync_router  # ← УБЕДИСЬ, ЧТО sync.py СУЩЕСТВУЕТ
 
-app = FastAPI(title="Health Monitor API")
+app = FastAPI(title="Health Monitor API", default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Подключаем роутеры
 app.include_router(auth_router)
@@ -12,7 +12,7 @@ class SensorVectorSync(BaseModel):
     heart_rate: Optional[int] = None
     hrv_rmssd: Optional[float] = None
     hrv_sdnn: Optional[float] = None
-    spo2: CrisOptional[int] = None
+    spo2: Optional[int] = None
     skin_temperature: Optional[float] = None
 
     accel_x: Optional[float] = None
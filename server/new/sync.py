@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from .schemas import SensorVectorSync
 from .models import SensorVector, User, Device
 from .database import get_db
@@ -29,14 +30,17 @@ async def sync_vectors(
     result = await db.execute(select(Device.id).where(Device.id.in_(device_ids), Device.user_id == user.id))
     valid_device_ids = {row[0] for row in result.fetchall()}
 
+    # Один multi-row INSERT вместо db.add() на каждую строку
+    rows = [
+        {**v.model_dump(), "user_id": user.id}
+        for v in vectors
+        if v.device_id in valid_device_ids
+    ]
     synced = 0
-    for v in vectors:
-        if v.device_id not in valid_device_ids:
-            continue
-
-        db_vector = SensorVector(**v.dict())
-        db.add(db_vector)
-        synced += 1
-
-    await db.commit()
+    if rows:
+        # RETURNING отдаёт только вставленные строки — повторы не считаются
+        stmt = insert(SensorVector).on_conflict_do_nothing().returning(SensorVector.id)
+        result = await db.execute(stmt, rows)
+        synced = len(result.all())
+        await db.commit()
     return {"status": "synced", "count": synced}
\ No newline at end of file
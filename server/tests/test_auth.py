@@ -0,0 +1,78 @@
+# server/tests/test_auth.py
+import asyncio
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import main
+from new import auth
+
+SECRET_KEY = "test-secret-key-for-pytest-0123456789"
+
+
+def call_main(credentials):
+    return main.verify_token(credentials)
+
+
+def call_new(credentials):
+    return asyncio.run(auth.verify_token(credentials))
+
+
+@pytest.fixture(params=[(main, call_main), (auth, call_new)], ids=["main", "new.auth"])
+def verifier(request):
+    module, call = request.param
+    module.decode_token.cache_clear()
+    yield module, call
+    module.decode_token.cache_clear()
+
+
+def make_credentials(payload, key=SECRET_KEY):
+    token = jwt.encode(payload, key, algorithm="HS256")
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_valid_token_returns_username(verifier):
+    module, call = verifier
+    credentials = make_credentials({"sub": "alice", "exp": int(time.time()) + 60})
+
+    assert call(credentials) == "alice"
+    assert call(credentials) == "alice"
+    assert module.decode_token.cache_info().hits == 1
+
+
+def test_cached_token_expires_between_calls(verifier, monkeypatch):
+    module, call = verifier
+    exp = int(time.time()) + 60
+    credentials = make_credentials({"sub": "alice", "exp": exp})
+
+    assert call(credentials) == "alice"
+
+    # Запись осталась в кэше, но срок истёк (граница exp == now уже недействительна)
+    monkeypatch.setattr(module.time, "time", lambda: exp)
+    with pytest.raises(HTTPException) as exc:
+        call(credentials)
+    assert exc.value.status_code == 401
+    assert module.decode_token.cache_info().hits == 1
+
+
+def test_bad_signature_is_rejected_and_not_cached(verifier):
+    module, call = verifier
+    credentials = make_credentials({"sub": "alice", "exp": int(time.time()) + 60}, key="wrong-secret-key-for-pytest-0123456789")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            call(credentials)
+        assert exc.value.status_code == 401
+    assert module.decode_token.cache_info().currsize == 0
+
+
+def test_missing_sub_is_rejected(verifier):
+    _, call = verifier
+    credentials = make_credentials({"exp": int(time.time()) + 60})
+
+    with pytest.raises(HTTPException) as exc:
+        call(credentials)
+    assert exc.value.status_code == 401